@@ -4,13 +4,21 @@ Provides context managers and query interfaces for safe item manipulation.
 """
 
 from contextlib import contextmanager
-from typing import List, Optional, Callable, Union, Dict, Any
+from functools import partial
+from typing import List, Optional, Callable, Union, Dict, Any, Iterator
 from pathlib import Path
 import logging
-import json
 from dataclasses import dataclass
+import copy
 
-from .item import Item
+from ..item import Item
+from ...misc import fast_json
+
+
+_logger = logging.getLogger(__name__)
+
+# Sentinel for keys missing from an item's data (None is a valid value to filter on)
+_MISSING = object()
 
 
 @dataclass
@@ -26,23 +34,31 @@ class ItemEditSession:
     """
     Context manager for editing items. Provides transaction-like behavior
     where changes are only saved if the context exits successfully.
+
+    By default the items' attributes are copied on entry so a rollback just restores them.
+    With cold_snapshot=True the items are kept serialized instead, which uses less memory
+    for large sessions but makes a rollback rebuild each item from its serialized data.
     """
     
-    def __init__(self, repo: 'Repo', items: List[Item], auto_save: bool = True):
+    def __init__(self, repo: 'Repo', items: List[Item], auto_save: bool = True, cold_snapshot: bool = False):
         self.repo = repo
         self.items = items
         self.auto_save = auto_save
+        self.cold_snapshot = cold_snapshot
         self.original_data = {}
+        self.original_attributes = {}
         self._changes_made = False
-        self._logger = logging.getLogger(__name__)
         
     def __enter__(self) -> List[Item]:
         """Enter the editing session and create backups."""
         # Create backup of original item data
         for item in self.items:
-            self.original_data[item.uuid] = item.to_dict()
+            if self.cold_snapshot:
+                self.original_data[item.uuid] = fast_json.dumps(item.to_dict())
+            else:
+                self.original_attributes[item.uuid] = copy.deepcopy(item.__dict__)
         
-        self._logger.debug(f"Started edit session for {len(self.items)} items")
+        _logger.debug("Started edit session for %d items", len(self.items))
         return self.items
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -51,34 +67,39 @@ class ItemEditSession:
             # Success - save changes if auto_save is enabled
             if self.auto_save:
                 self.save()
-                self._logger.debug(f"Auto-saved {len(self.items)} items")
+                _logger.debug("Auto-saved %d items", len(self.items))
         else:
             # Exception occurred - rollback changes
             self.rollback()
-            self._logger.warning(f"Exception in edit session, rolled back {len(self.items)} items")
+            _logger.warning("Exception in edit session, rolled back %d items", len(self.items))
             
         return False  # Don't suppress exceptions
     
     def save(self) -> None:
         """Manually save all items in the session."""
-        for item in self.items:
-            self.repo._save_single_item(item)
+        # Synced, in one batch. The repo skips the files of items that haven't changed
+        self.repo._save_items(self.items, sync=True)
         self._changes_made = False
-        self._logger.info(f"Saved {len(self.items)} items")
+        _logger.info("Saved %d items", len(self.items))
     
     def rollback(self) -> None:
         """Rollback all items to their original state."""
         for item in self.items:
-            if item.uuid in self.original_data:
+            if item.uuid in self.original_attributes:
+                # Put the item's original attributes back
+                original_attributes = self.original_attributes[item.uuid]
+                item.__dict__.clear()
+                item.__dict__.update(original_attributes)
+            elif item.uuid in self.original_data:
                 # Restore original data by reconstructing the item
-                original_dict = self.original_data[item.uuid]
+                original_dict = fast_json.loads(self.original_data[item.uuid])
                 restored_item = Item.from_dict(original_dict)
                 
                 # Update the current item's data
                 item.__dict__.update(restored_item.__dict__)
         
         self._changes_made = False
-        self._logger.info(f"Rolled back {len(self.items)} items")
+        _logger.info("Rolled back %d items", len(self.items))
     
     def mark_changed(self) -> None:
         """Mark that changes have been made (for manual tracking)."""
@@ -108,53 +129,78 @@ class EnhancedRepo:
         Returns:
             List of items matching the criteria
         """
-        filtered_items = list(self.items)  # Start with all items
-        
-        # Apply UUID filter
+        if uuid_filter and self._items is None:
+            # The repo hasn't loaded its items, so just read the requested items' files
+            return self._query_items(uuid_filter, item_type, data_filter, custom_filter)
+
+        self._check_item_indexes()
+        return self._query_items(uuid_filter, item_type, data_filter, custom_filter)
+
+    def _query_items(self,
+                     uuid_filter: Optional[Union[str, List[str]]],
+                     item_type: Optional[str],
+                     data_filter: Optional[Dict[str, Any]],
+                     custom_filter: Optional[Callable[[Item], bool]]) -> List[Item]:
+        """Get the items matching the filter criteria, without going through the query cache."""
+        # Start from the smallest candidate set the indexes can give us, then check the remaining
+        # filters in a single pass over the candidates
+        predicates = []
+
         if uuid_filter:
             if isinstance(uuid_filter, str):
                 uuid_filter = [uuid_filter]
-            filtered_items = [item for item in filtered_items if item.uuid in uuid_filter]
-        
-        # Apply item type filter
-        if item_type:
-            filtered_items = [item for item in filtered_items 
-                            if item.__class__.UNIQUE_NAME == item_type]
+            get_item = self.get_item if self._items is None else self._by_uuid.get
+            filtered_items = [item for item in map(get_item, dict.fromkeys(uuid_filter)) if item is not None]
+            if item_type:
+                predicates.append(lambda item: item.__class__.UNIQUE_NAME == item_type)
+        elif item_type:
+            filtered_items = list(self._by_type.get(item_type, {}).values())
+        else:
+            filtered_items = self.items  # Start with all items
         
-        # Apply data filter
         if data_filter:
-            filtered_items = [item for item in filtered_items 
-                            if self._matches_data_filter(item, data_filter)]
+            predicates.append(partial(self._matches_compiled_filter, compiled_filter=self._compile_data_filter(data_filter)))
         
-        # Apply custom filter
         if custom_filter:
-            filtered_items = [item for item in filtered_items if custom_filter(item)]
-        
+            predicates.append(custom_filter)
+
+        if len(predicates) == 1:
+            filtered_items = list(filter(predicates[0], filtered_items))
+        elif predicates:
+            filtered_items = [item for item in filtered_items if all(predicate(item) for predicate in predicates)]
+        elif filtered_items is self._items:
+            filtered_items = list(filtered_items)  # Never hand out the repo's own item list
+
         return filtered_items
     
-    def _matches_data_filter(self, item: Item, data_filter: Dict[str, Any]) -> bool:
-        """Check if an item's data matches the filter criteria."""
-        item_data = item._to_dict()
-        
-        for key, expected_value in data_filter.items():
-            if key not in item_data:
-                return False
-            
-            actual_value = item_data[key]
-            
-            # Support nested key access with dot notation
-            if '.' in key:
-                keys = key.split('.')
+    @staticmethod
+    def _compile_data_filter(data_filter: Dict[str, Any]) -> List[tuple]:
+        """
+        Analyse a data filter's keys once per query, so matching each item is just lookups.
+
+        Returns a list of (key, key_path, expected_value) tuples, where key_path is the dotted key
+        split into a tuple of nested keys, or None if the key is not dotted.
+        """
+        return [
+            (key, tuple(key.split('.')) if '.' in key else None, expected_value)
+            for key, expected_value in data_filter.items()
+        ]
+
+    def _matches_compiled_filter(self, item: Item, compiled_filter: List[tuple]) -> bool:
+        """Check if an item's data matches a data filter compiled by _compile_data_filter."""
+        item_data = item._to_dict() # Built fresh each time, since items are often changed in place
+
+        for key, key_path, expected_value in compiled_filter:
+            if key_path is None:
+                actual_value = item_data.get(key, _MISSING)
+            else:
+                # Support nested key access with dot notation
                 actual_value = item_data
-                for k in keys:
-                    if isinstance(actual_value, dict) and k in actual_value:
-                        actual_value = actual_value[k]
-                    else:
-                        return False
-            
-            if actual_value != expected_value:
+                for nested_key in key_path:
+                    actual_value = actual_value.get(nested_key, _MISSING) if actual_value.__class__ is dict else _MISSING
+            if actual_value is _MISSING or actual_value != expected_value:
                 return False
-        
+
         return True
     
     @contextmanager
@@ -163,7 +209,8 @@ class EnhancedRepo:
                    item_type: Optional[str] = None,
                    data_filter: Optional[Dict[str, Any]] = None,
                    custom_filter: Optional[Callable[[Item], bool]] = None,
-                   auto_save: bool = True) -> ItemEditSession:
+                   auto_save: bool = True,
+                   cold_snapshot: bool = False) -> Iterator[List[Item]]:
         """
         Context manager for editing items with transaction-like behavior.
         
@@ -174,62 +221,67 @@ class EnhancedRepo:
                 # Items are automatically saved on successful exit
         """
         items = self.get_items(uuid_filter, item_type, data_filter, custom_filter)
+
+        if not items:
+            # Nothing to snapshot or save, so don't set up a session at all
+            yield items
+            return
         
-        session = ItemEditSession(self, items, auto_save)
-        
-        try:
-            yield session.__enter__()
-        except Exception as e:
-            session.__exit__(type(e), e, e.__traceback__)
-            raise
-        else:
-            session.__exit__(None, None, None)
+        # The session's own __exit__ saves or rolls back, and sees any exception raised in the with-block
+        with ItemEditSession(self, items, auto_save, cold_snapshot) as session_items:
+            yield session_items
     
     def _save_single_item(self, item: Item) -> None:
         """Save a single item to disk."""
-        items_dir = self._repo_path / "items"
-        
-        if not items_dir.is_dir():
-            items_dir.mkdir(parents=True, exist_ok=True)
-        
-        item_file = items_dir / f"{item.uuid}.json"
-        item_json = json.dumps(item.to_dict(), indent=4 if self.config.use_pretty_json else None)
-        item_file.write_text(item_json)
+        self._save_items([item], sync=True)
     
     def get_item_by_uuid(self, uuid: str) -> Optional[Item]:
-        """Get a single item by UUID."""
-        items = self.get_items(uuid_filter=uuid)
-        return items[0] if items else None
+        """Get a single item by UUID. If the repo's items haven't been loaded, only this item's file is read."""
+        return self.get_item(uuid)
     
     def update_item(self, item: Item) -> None:
         """Update a single item in the repository."""
+        self._check_item_indexes()
+
         # Find and replace the item in memory
-        for i, existing_item in enumerate(self._items):
-            if existing_item.uuid == item.uuid:
-                self._items[i] = item
-                break
-        else:
+        existing_item = self._by_uuid.get(item.uuid)
+        if existing_item is None:
             # Item not found, add it
+            position = len(self._items)
             self._items.append(item)
+        else:
+            position = self._item_positions[item.uuid]
+            self._items[position] = item
+            self._unindex_item(existing_item)
+        self._index_item(item, position)
         
         # Save to disk
         self._save_single_item(item)
     
     def delete_item(self, uuid: str) -> bool:
         """Delete an item by UUID. Returns True if item was deleted."""
+        self._check_item_indexes()
+
         # Remove from memory
-        original_count = len(self._items)
-        self._items = [item for item in self._items if item.uuid != uuid]
-        
-        if len(self._items) == original_count:
+        item = self._by_uuid.get(uuid)
+        if item is None:
             return False  # Item not found
+
+        # Move the last item into the deleted item's slot rather than shifting everything after it
+        position = self._item_positions[uuid]
+        last_item = self._items.pop()
+        if last_item is not item:
+            self._items[position] = last_item
+            self._item_positions[last_item.uuid] = position
+        self._unindex_item(item)
         
         # Remove from disk
-        items_dir = self._repo_path / "items"
-        item_file = items_dir / f"{uuid}.json"
+        item_file = Path(self._items_dir) / f"{uuid}.json"
         
         if item_file.exists():
             item_file.unlink()
+        self._file_digests.pop(uuid, None) # The file is gone, so it must be written if the item comes back
+        self._dirty.discard(uuid)
         
         return True
 
@@ -296,5 +348,5 @@ def safe_item_operation(repo: EnhancedRepo,
             return result
             
     except Exception as e:
-        logging.error(f"Operation failed for item {uuid}: {e}")
+        _logger.error("Operation failed for item %s: %s", uuid, e)
         return default_value
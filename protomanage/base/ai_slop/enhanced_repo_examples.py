@@ -32,7 +32,7 @@ class ExampleUsage:
         with self.repo.edit_items(item_type="protomanage.core.inbox-item") as items:
             for item in items:
                 # Add a timestamp to all inbox items
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data['last_modified'] = "2025-07-09"
     
     def example_3_conditional_editing(self):
@@ -46,7 +46,7 @@ class ExampleUsage:
         with self.repo.edit_items(custom_filter=is_high_priority) as items:
             for item in items:
                 # Mark high priority items as urgent
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data['urgent'] = True
     
     def example_4_data_filter_editing(self):
@@ -56,7 +56,7 @@ class ExampleUsage:
         with self.repo.edit_items(data_filter={'status': 'pending', 'category': 'work'}) as items:
             for item in items:
                 # Update all pending work items
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data['status'] = 'in_progress'
     
     def example_5_manual_save_control(self):
@@ -86,7 +86,7 @@ class ExampleUsage:
         
         def update_priority(item: Item) -> bool:
             """Update an item's priority and return success status."""
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['priority'] = 'high'
                 return True
             return False
@@ -109,7 +109,7 @@ class ExampleUsage:
         
         def mark_as_processed(item: Item):
             """Mark an item as processed."""
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['processed'] = True
                 item.data['processed_date'] = "2025-07-09"
         
@@ -140,7 +140,7 @@ class ExampleUsage:
                 
                 with self.repo.edit_items(uuid_filter=batch_uuids) as batch_items:
                     for item in batch_items:
-                        if hasattr(item, 'data'):
+                        if item.__class__.HAS_DATA:
                             item.data['status'] = 'published'
                 
                 print(f"Processed batch {i//batch_size + 1}")
@@ -148,7 +148,7 @@ class ExampleUsage:
             # Process all at once
             with self.repo.edit_items(data_filter={'status': 'draft'}) as items:
                 for item in items:
-                    if hasattr(item, 'data'):
+                    if item.__class__.HAS_DATA:
                         item.data['status'] = 'published'
     
     def example_9_nested_data_filtering(self):
@@ -169,7 +169,7 @@ class ExampleUsage:
         try:
             with self.repo.edit_items(item_type="protomanage.core.inbox-item") as items:
                 for i, item in enumerate(items):
-                    if hasattr(item, 'data'):
+                    if item.__class__.HAS_DATA:
                         item.data['batch_number'] = i
                         
                         # Simulate an error condition
@@ -218,7 +218,7 @@ class MyEnhancedRepo(Repo, EnhancedRepo):
     def archive_completed_items(self) -> int:
         """Archive all completed items."""
         def mark_archived(item: Item):
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['archived'] = True
                 item.data['archive_date'] = "2025-07-09"
         
@@ -244,7 +244,7 @@ class ItemService:
         count = 0
         with self.repo.edit_items(uuid_filter=uuids) as items:
             for item in items:
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data['read'] = True
                     count += 1
         return count
@@ -252,7 +252,7 @@ class ItemService:
     def update_item_priority(self, uuid: str, priority: str) -> bool:
         """Update the priority of a specific item."""
         def set_priority(item: Item) -> bool:
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['priority'] = priority
                 return True
             return False
@@ -262,7 +262,7 @@ class ItemService:
     def batch_update_category(self, old_category: str, new_category: str) -> int:
         """Update category for all items with the old category."""
         def update_category(item: Item):
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['category'] = new_category
         
         return bulk_edit_items(
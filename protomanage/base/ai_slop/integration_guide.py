@@ -14,13 +14,15 @@ from .repo import Repo, REPO_FOLDER_NAME
 
 from .enhanced_repo import EnhancedRepo
 
+_logger = logging.getLogger(__name__) # Look the logger up once, not in every Repo.__init__
+
 class Repo(EnhancedRepo):
     """Your existing Repo class with enhanced functionality."""
+
+    _logger = _logger
     
     def __init__(self, repo_path: Path):
         # Your existing initialization code
-        self._logger = logging.getLogger(__name__)
-        
         if not repo_path.is_dir():
             raise FileNotFoundError(f"repo path '{repo_path}' does not exist or is not a directory.")
         if repo_path.name != REPO_FOLDER_NAME:
@@ -77,14 +79,17 @@ def add_enhanced_methods_to_repo():
     
     def bulk_update_data(self, filter_criteria: dict, updates: dict):
         """Bulk update data fields for items matching criteria."""
-        count = 0
+        updated_items = []
         for item in self.items:
             if self._item_matches_criteria(item, filter_criteria):
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data.update(updates)
-                    self._save_single_item(item)
-                    count += 1
-        return count
+                    self.mark_dirty(item)  # data was changed in place, so tell the repo to save it
+                    updated_items.append(item)
+
+        # Serialize everything first, then write all the dirty files in one batch (each via a temp file and os.replace)
+        self.save_items()
+        return len(updated_items)
     
     def _item_matches_criteria(self, item: Item, criteria: dict) -> bool:
         """Check if an item matches the given criteria."""
@@ -147,7 +152,7 @@ def integrate_with_cli():
         repo = find_repo(Path.cwd())
         
         def mark_read(item):
-            if hasattr(item, 'data'):
+            if item.__class__.HAS_DATA:
                 item.data['read'] = True
         
         count = bulk_edit_items(
@@ -165,7 +170,7 @@ def integrate_with_cli():
         with repo.edit_items(uuid_filter=uuid) as items:
             if items:
                 item = items[0]
-                if hasattr(item, 'data'):
+                if item.__class__.HAS_DATA:
                     item.data['priority'] = priority
                 typer.echo(f"Updated priority for item {uuid}")
             else:
@@ -1,15 +1,21 @@
-"""Module to create dataclass ExecutionContext"""
+"""Module to create class ExecutionContext"""
 
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass
+from functools import lru_cache
 from typing import List
 import os
 import sys
 
-@dataclass
+# Items are mostly added from a handful of directories, so share one Path object per directory
+# rather than building a new one for every item loaded
+_parse_cwd = lru_cache(maxsize=512)(Path)
+
 class ExecutionContext():
-    """A data class that stores context of when and where a command was run."""
+    """A class that stores context of when and where a command was run."""
+    # Every stored item carries one of these, so keep them small
+    __slots__ = ("cwd", "time", "machine", "user", "command")
+
     cwd: Path
     time: datetime
     machine: str
@@ -24,6 +30,10 @@ class ExecutionContext():
         self.user = os.environ.get("USER", "")
         self.command = sys.argv
 
+    def __repr__(self):
+        """Return a string representation of the ExecutionContext, listing its fields."""
+        return f"{self.__class__.__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
     def to_dict(self):
         """Return a dictionary with this class' data"""
 
@@ -40,9 +50,9 @@ class ExecutionContext():
         """Return an ExecutionContext object from a dict"""
 
         obj = cls.__new__(cls)
-        obj.cwd      = Path(data["cwd"])
+        obj.cwd      = _parse_cwd(data["cwd"])
         obj.time     = datetime.fromisoformat(data["time"])
-        obj.machine  = data["machine"]
-        obj.user     = data["user"]
+        obj.machine  = sys.intern(data["machine"])
+        obj.user     = sys.intern(data["user"])
         obj.command  = data["command"]
         return obj
@@ -2,8 +2,7 @@
 
 import uuid
 from abc import ABCMeta, abstractmethod
-
-from ..misc.words import wordify
+from functools import cached_property
 
 class ItemMeta(ABCMeta):
     """
@@ -21,14 +20,15 @@ class ItemMeta(ABCMeta):
             ################################################################################
             if "__init__" in cls.__dict__:
                 orig_init = cls.__init__
+                base_inits = _base_inits(cls) # Worked out once here, rather than walking the MRO for every new instance
 
                 def wrapped_init(self, *args, **kwargs):
                     # Call base class __init__ first
-                    for base in cls.__mro__[1:]:
-                        if "__init__" in base.__dict__:
-                            base.__init__(self)
+                    for base_init in base_inits:
+                        base_init(self)
                     orig_init(self, *args, **kwargs)
 
+                wrapped_init.__wrapped__ = orig_init # So subclasses can call the unwrapped __init__ (see _base_inits)
                 cls.__init__ = wrapped_init
 
             ################################################################################
@@ -42,7 +42,7 @@ class ItemMeta(ABCMeta):
                     for base in cls.__mro__[1:]:
                         if "__init_subclass__" in base.__dict__:
                             base.__init_subclass__(self)
-                        orig_init_subclass(self,*args,**kwargs)
+                    orig_init_subclass(self,*args,**kwargs)
 
                 cls.__init_subclass__ = wrapped_init_subclass
 
@@ -54,16 +54,38 @@ class ItemMeta(ABCMeta):
             assert "VERSION" in cls.__dict__
             assert cls.UNIQUE_NAME != cls.__base__.UNIQUE_NAME
 
+            # Register every descendant of Item (not just direct children) so from_dict can find it by name
+            Item.ITEM_CLASSES[(cls.UNIQUE_NAME, cls.VERSION)] = cls
+
         cls.CHILD_CLASSES = []
 
         return cls
 
+def _base_inits(cls) -> tuple:
+    """
+    Get the __init__ methods of cls's base classes which its own __init__ must call, furthest base first.
+
+    Walking the MRO in reverse reaches every base exactly once, even one shared by two bases (a diamond).
+    The __init__ of an item class is taken from under ItemMeta's wrapper, which would call its bases again.
+    """
+    base_inits = []
+    for base in reversed(cls.__mro__[1:]):
+        if base is object or "__init__" not in base.__dict__:
+            continue
+        base_init = base.__dict__["__init__"]
+        if isinstance(base, ItemMeta):
+            base_init = getattr(base_init, "__wrapped__", base_init)
+        base_inits.append(base_init)
+    return tuple(base_inits)
+
 class Item(metaclass=ItemMeta):
     """Base class for items in Protomanage."""
 
     DISPLAY_NAME = "Item base class"
     UNIQUE_NAME = "protomanage.core.item-abstract-base-class"
     VERSION = "0.1"
+    HAS_DATA = False # Item types which keep their data in a 'data' dict attribute should set this to True
+    ITEM_CLASSES = {} # Maps (UNIQUE_NAME, VERSION) to the Item subclass, filled in by ItemMeta
 
     def __init_subclass__(cls):
         assert isinstance(cls,ItemMeta), "Subclass must use ItemMeta or a descendant as its metaclass"
@@ -74,24 +96,33 @@ class Item(metaclass=ItemMeta):
 
         self._uuid = str(uuid.uuid4())
 
+    @classmethod
+    def has_data(cls) -> bool:
+        """Check whether items of this type keep their data in a 'data' dict attribute."""
+        return cls.HAS_DATA
+
     @property
     def uuid(self) -> str:
         """Get the unique identifier of the item."""
         return self._uuid
 
-    @property
+    # The UUID never changes once an item is created or loaded, so the identifiers derived from it
+    # are worked out on first use and kept (cached_property bypasses __setattr__, so this doesn't
+    # count as a change to the item)
+    @cached_property
     def formatted_uid(self) -> str:
         """Get the formatted unique identifier of the item."""
         return f"[{self.uuid[-10:-5]}_{self.uuid[-5:]}]"
 
-    @property
+    @cached_property
     def word_uid(self) -> str:
         """Get the 'wordy' unique identifier of the item."""
+        from ..misc.words import wordify # Only needed for display, so don't load the word lists until then
         return wordify(self.uuid[-8:])
 
-    def to_dict(self) -> str:
+    def to_dict(self) -> dict:
         """
-        Transform the item instance into a dictionary.
+        Transform the item instance into a dictionary of JSON primitives, ready to serialize as-is.
 
         The resulting dict contains two main sections:
           - "type": An object with metadata about the item's type (Python class), including display name, unique name, and version.
@@ -111,21 +142,19 @@ class Item(metaclass=ItemMeta):
         }
 
     @classmethod
-    def from_dict(cls, dict : dict) -> "Item":
-        """TODO docs: write docstring"""
+    def from_dict(cls, item_dict : dict, uuid : str = None) -> "Item":
+        """TODO docs: write docstring. If the caller already knows the item's UUID it can pass it in, instead of it being read from the dict."""
 
-        type_info = dict["type"]
+        type_info = item_dict["type"]
         item_unique_name = type_info["unique_name"]
         item_version = type_info["version"]
-        item_uuid = dict["uuid"]
+        item_uuid = uuid if uuid is not None else item_dict["uuid"]
 
-        obj = None
         # Find the appropriate Item subclass and instantiate it
-        for child in cls.CHILD_CLASSES: # TODO fix this: grandchildren of Item() won't be found due to CHILD_CLASSES only going up one level. Need some metaclass trickery here
-            if child.UNIQUE_NAME == item_unique_name and child.VERSION == item_version:
-                obj = child._from_dict(dict["data"],dict["type"])
-        if not obj:
+        child = Item.ITEM_CLASSES.get((item_unique_name, item_version))
+        if child is None:
             raise ValueError(f"No matching Item subclass for UNIQUE_NAME={item_unique_name} and VERSION={item_version}")
+        obj = child._from_dict(item_dict["data"],type_info)
 
         # Assign base class members
         obj._uuid = item_uuid
@@ -138,5 +167,5 @@ class Item(metaclass=ItemMeta):
         """Child classes must implement this"""
 
     @abstractmethod
-    def _to_dict(self) -> str:
-        """Child classes must implement this"""
+    def _to_dict(self) -> dict:
+        """Child classes must implement this, building the dict by hand from JSON primitives (no dataclasses.asdict)"""
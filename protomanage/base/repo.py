@@ -1,19 +1,45 @@
 """Create classes for Protomanage repositories, home repository, and repository config."""
 
 from pathlib import Path
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import importlib.util
 import uuid as uuid_lib
 import logging
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
+import tempfile
+import copy
+import hashlib
+import pickle
 import json
 import sys
 import os
 
 from .item import Item
+from . import execution_context
+from ..misc import fast_json
+from ..misc.exceptions import ItemLockedError
 
 REPO_FOLDER_NAME = ".protomanage"
 HOME_REPO_PATH = (Path("~") / REPO_FOLDER_NAME).expanduser()
+ITEM_CACHE_FILE_NAME = ".items.cache"
+ITEM_CACHE_FORMAT = 2 # Bump whenever the layout of the item cache file changes
+SMALL_FILE_READ_SIZE = 65536 # Bytes asked for per read of a repo file; nearly all item files fit in one read
+PARALLEL_IO_THRESHOLD = 32 # Below this many item files, reading/writing them one by one is quicker than using the pool
+LOAD_BATCH_SIZE = 256 # How many item files are read ahead on the pool at once, to bound the bytes held in memory
+
+_logger = logging.getLogger(__name__) # Looked up once here; the classes below share it as a class attribute
+_umask = os.umask(0); os.umask(_umask) # The only way to read the umask is to set it, so do it once at import
+NEW_FILE_MODE = 0o666 & ~_umask # The mode open() would give a new file
+_io_executor = None
+_parsed_config_files = {} # Parsed config.json contents shared by all repos in the process: {path: (fingerprint, data)}
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Get the thread pool shared by all repos for item file I/O, creating it on first use."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4))
+    return _io_executor
 
 class MultiItemEditSession:
     """
@@ -25,9 +51,10 @@ class MultiItemEditSession:
             # backed up and will be saved when you're done
     """
 
+    _logger = _logger
+
     def __init__(self, items: List["Item"]):
         self.items = items
-        self._logger = logging.getLogger(__name__)
         self.sessions = []
 
     def __enter__(self) -> List["Item"]:
@@ -36,6 +63,7 @@ class MultiItemEditSession:
             item_edit_session = ItemEditSession(item)
             item_edit_session.__enter__()
             self.sessions.append(item_edit_session)
+        return self.items
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close the edit sessions open for each item"""
@@ -48,18 +76,19 @@ class ItemEditSession:
     Context manager for editing items. Provides transaction-like behavior
     where changes are only saved if the context exits successfully.
     """
-    locked_items = []
+
+    _logger = _logger
+    locked_items = set() # UUIDs of the items currently open for edit
 
     def __init__(self, item: "Item"):
         self.item = item
-        self._logger = logging.getLogger(__name__)
 
     def __enter__(self) -> "Item":
         """Enter the editing session and create a backup."""
-        if self.item in ItemEditSession.locked_items:
+        if self.item.uuid in ItemEditSession.locked_items:
             raise ItemLockedError(f"Item {self.item} is already opened for edit in another ItemEditSession")
 
-        ItemEditSession.locked_items.append(self.item)
+        ItemEditSession.locked_items.add(self.item.uuid)
 
         # Create backup of original item data
         self.item._create_backup()
@@ -82,17 +111,17 @@ class ItemEditSession:
             )
 
         # Remove the item from locked_items regardless of exception
-        if self.item in ItemEditSession.locked_items:
-            ItemEditSession.locked_items.remove(self.item)
+        ItemEditSession.locked_items.discard(self.item.uuid)
 
         return False  # Don't suppress exceptions
 
-@dataclass
 class RepoConfig():
-    """Dataclass to store config for a Protomanage repository."""
+    """Stores the config for a Protomanage repository."""
+
+    _logger = _logger
+    _config_keys = None # Names of the config keys, worked out on first use by config_keys()
 
     def __init__(self, config_file_path : Path = None):
-        self._logger = logging.getLogger(__name__)
         self.config_file_path = config_file_path
         self.customised_keys = []
 
@@ -106,36 +135,50 @@ class RepoConfig():
         else:
             self._logger.debug(f"Got no config file path, using default values")
 
+    @classmethod
+    def config_keys(cls) -> frozenset:
+        """Get the names of all the config keys, i.e. the attributes set by __init_defaults."""
+        if cls._config_keys is None:
+            defaults = object.__new__(cls)
+            defaults.__init_defaults()
+            cls._config_keys = frozenset(vars(defaults))
+        return cls._config_keys
+
     def __init_defaults(self) -> None:
         self.default_text_editor    : str     = os.environ.get("EDITOR") or ("notepad" if os.name == "nt" else "vim")
         self.use_pretty_json        : bool    = False
         self.plugin_configs         : dict    = {}
+        self.scratch_dir            : str     = None # Where to put temporary files for editing, None for the system default
+        self.cache_items            : bool    = True # Keep a pickle of the parsed items so unchanged ones needn't be re-parsed
         # Want to add new config keys? Just put them right here.
 
     def __load_from_file(self) -> None:
-        if not self.config_file_path or not Path(self.config_file_path).exists():
+        try:
+            config_json = _read_small_file(self.config_file_path)
+        except FileNotFoundError:
             self._logger.warning(f"Config file {self.config_file_path} does not exist.")
             return
 
-        with open(self.config_file_path, "r", encoding="utf8") as f:
-            try:
-                config_data = json.load(f)
-            except json.JSONDecodeError as e:
-                self._logger.error(f"Invalid JSON in config file {self.config_file_path}: {e}")
-                raise
+        try:
+            config_data = fast_json.loads(config_json)
+        except json.JSONDecodeError as e: # orjson's decode error is a subclass of this one
+            self._logger.error(f"Invalid JSON in config file {self.config_file_path}: {e}")
+            raise
 
+        # Only set_key() writes the file back; loading it shouldn't
         for key, value in config_data.items():
             self.__set_key(key,value)
 
-        self.__save_to_file()
-
     def set_key(self,key,value):
+        if key in self.customised_keys and getattr(self, key) == value:
+            return # Already saved with this value, so there's nothing to write
         self.__set_key(key,value)
         self.__save_to_file()
 
     def __set_key(self,key,value):
-        if hasattr(self, key):
-            self._logger.debug(f"Setting config attribute '{key}' to '{value}'")
+        if key in self.config_keys():
+            if _logger.isEnabledFor(logging.DEBUG):
+                _logger.debug(f"Setting config attribute '{key}' to '{value}'")
             setattr(self, key, value)
             self.customised_keys.append(key)
         else:
@@ -144,106 +187,262 @@ class RepoConfig():
 
     def __save_to_file(self):
         config_to_save = {key: getattr(self, key) for key in self.customised_keys}
-        with open(self.config_file_path, "w", encoding="utf8") as f:
-            json.dump(config_to_save, f, indent=4 if self.use_pretty_json else None)
+        write_bytes_atomic(self.config_file_path, fast_json.dumps(config_to_save, pretty=self.use_pretty_json))
         self._logger.debug(f"Saved user's customised config keys to {self.config_file_path}")
 
 class Repo():
     """A Protomanage repository class."""
 
+    _logger = _logger
+
     def __init__(self,repo_path : Path):
         """Load in a Protomanage repo from the specified path."""
 
-        self._logger     = logging.getLogger(__name__)
-
         # Check the path provided is valid
-        if not repo_path.is_dir():
+        try:
+            # One listing of the repo folder tells us which of its files exist, rather than a stat per file
+            self._repo_entries = _scan_dir(repo_path)
+        except (FileNotFoundError, NotADirectoryError):
             raise FileNotFoundError(f"repo path '{repo_path}' does not exist or is not a directory.")
         if repo_path.name != REPO_FOLDER_NAME:
             raise ValueError(f"repo path '{repo_path}' does not end with expected {REPO_FOLDER_NAME}")
 
         self._repo_path = repo_path
-        self._load_config()
+        self._items_dir = os.path.join(repo_path, "items") # Kept as a str, since item file paths are built from it in hot loops
+        self._config     = None # Loaded on first access to self.config
+        self._config_fingerprint = None # Fingerprint of config.json when the config was loaded
         self._uuid       = self._load_uuid() # TODO rewrite to assign var inside the method
-        self._plugins    = self._load_plugins() # TODO rewrite to assign var inside the method
-        self._items      = self._load_items() # TODO rewrite to assign var inside the method
-        self._pm_version = self._load_version() # TODO rewrite to assign var inside the method
+        self._plugins    = None # Loaded on first access to self.plugins
+        self._plugin_index = None # Maps plugin names to their __init__.py, found on first use
+        self._imported_plugins = {} # Plugins imported so far, by name
+        self._items      = None # Loaded on first access to self.items
+        self._single_loaded_items = {} # Items loaded one at a time by get_item() before self.items was loaded
+        self._dirty      = set() # UUIDs of items changed in memory but not yet saved
+        self._by_uuid    = {} # Indexes over self.items, built when the items are loaded
+        self._by_type    = {} # Maps each item type's UNIQUE_NAME to {uuid: item}
+        self._item_positions = {} # Maps each item's UUID to its position in self.items
+        self._file_digests = {} # Digest of each item file's contents as last read or written by this repo
+        self._pm_version = None # Loaded on first access to self.pm_version
 
     def _load_config(self):
         """Load the repo config. Take the local config.json first, then the defaults from the install."""
 
+        config_file = self._repo_file("config.json")
+        fingerprint = _file_fingerprint(config_file) if config_file is not None else None
+        if self._config is not None and fingerprint == self._config_fingerprint:
+            return # config.json hasn't changed since it was last loaded
+
         config = RepoConfig()
-        config_file = self.repo_path / "config.json"
 
-        if config_file.exists():
+        if config_file is not None:
             try:
                 self._logger.debug(f"Loading config from {config_file}")
-                config_data = json.loads(config_file.read_text())
+                config_data = _parse_config_file(config_file, fingerprint)
                 for key, value in config_data.items():
-                    if not hasattr(config, key):
+                    if key not in RepoConfig.config_keys():
                         self._logger.error(f"Unknown config key '{key}' in {config_file}")
                         raise ValueError(f"Unknown config key '{key}' in {config_file}")
                     if value is not None:
-                        self._logger.debug(f"Setting config '{key}' to '{value}' from {config_file}")
-                        setattr(config, key, value)
-                    else:
-                        self._logger.debug(f"Config key '{key}' in {config_file} is None, default value will be used.")
+                        if _logger.isEnabledFor(logging.DEBUG):
+                            _logger.debug(f"Setting config '{key}' to '{value}' from {config_file}")
+                        # The parsed data is shared with other repos using this file, so don't share mutable values
+                        setattr(config, key, copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+                    elif _logger.isEnabledFor(logging.DEBUG):
+                        _logger.debug(f"Config key '{key}' in {config_file} is None, default value will be used.")
             except json.JSONDecodeError as e:
                 self._logger.error(f"Invalid JSON in {config_file}: {e}")
                 raise ValueError(f"Invalid JSON in {config_file}: {e}") from e
 
         self._config = config
+        self._config_fingerprint = fingerprint
 
     def update_config(self) -> None:
+        self._repo_entries = _scan_dir(self._repo_path) # config.json may have been created since the repo was loaded
         self._load_config()
 
+    def _repo_file(self, name : str) -> Optional[Path]:
+        """Get the path of a file in the repo folder, or None if it didn't exist when the folder was last listed."""
+
+        return Path(self._repo_entries[name]) if name in self._repo_entries else None
+
     def _load_uuid(self) -> str:
         """Get the UUID of the repo from the uuid file."""
 
-        uuid_file = self._repo_path / "uuid"
-        if not uuid_file.exists():
-            self._logger.error(f"UUID file {uuid_file} missing.")
-            raise FileNotFoundError(f"UUID file {uuid_file} missing.")
+        uuid_file = self._repo_file("uuid")
+        if uuid_file is None:
+            self._logger.error(f"UUID file {self._repo_path / "uuid"} missing.")
+            raise FileNotFoundError(f"UUID file {self._repo_path / "uuid"} missing.")
 
-        return uuid_file.read_text().strip()
+        return _read_small_file(uuid_file, read_size=64).decode("utf8").strip() # A UUID is 36 bytes
 
     def _load_items(self) -> List[Item]:
-        """Load the items from the items.json file."""
+        """Load the items from their files in the items folder, reusing cached and already loaded items where possible."""
+
+        self.plugins # Plugins define the item classes, so they must be imported before any item is parsed
+
+        item_index = self._scan_item_index()
+        use_cache = self.config.cache_items
+        cache = self._read_item_cache() if use_cache else {}
+        new_cache = {}
+
+        items = [None] * len(item_index) # The scan tells us how many items there are, so fill the slots in place
+        to_load = [] # (position in items, path) for each item that has to be parsed from its file
+        for position, (uuid, path) in enumerate(item_index.items()):
+            fingerprint = _file_fingerprint(path) if use_cache else None
+            cached = cache.get(uuid)
+            cache_hit = cached is not None and cached[0] == fingerprint
+
+            # Reuse items already loaded by get_item() so there is only ever one object per item
+            item = self._single_loaded_items.pop(uuid, None)
+            if cache_hit:
+                self._file_digests[uuid] = cached[1] # So saving an unchanged item still skips its write
+            if item is None and cache_hit:
+                item = cached[2]
+            if item is None:
+                to_load.append((position, path))
+            else:
+                items[position] = item
 
-        items_dir = self._repo_path / "items"
-        if not items_dir.is_dir():
-            self._logger.warning(f"Items directory {items_dir} missing. Creating a new one.")
-            items_dir.mkdir()
-
-        items = []
-        for item_file in items_dir.iterdir():
-            if item_file.is_file() and item_file.suffix == ".json":
-                # Read in the file JSON
-                try:
-                    item_data = json.loads(item_file.read_text())
-                except Exception as e:
-                    self._logger.error(f"Failed to load item from {item_file}: {e}")
-                    raise ValueError(f"Failed to load item from {item_file}: {e}") from e
-
-                # Validate the file name matches the UUID in the JSON
-                if item_file.stem != item_data.get("uuid"):
-                    self._logger.error(f"UUID mismatch: file {item_file.name} vs item_data uuid {item_data.get("uuid")}")
-                    raise ValueError(f"UUID mismatch: file {item_file.name} vs item_data uuid {item_data.get("uuid")}") from e
-
-                # Convert to an Item and store it
-                items.append(Item.from_dict(item_data))
+            # Items from get_item() may have been changed since, so only cache them if the entry is still valid
+            if cache_hit or item is None:
+                new_cache[uuid] = cached if cache_hit else (fingerprint, None, None)
+
+        paths = [path for _, path in to_load]
+        if len(paths) >= PARALLEL_IO_THRESHOLD:
+            loaded = self._load_item_files_parallel(paths)
+        else:
+            loaded = map(self._load_item_file, paths)
+        for (position, _), item in zip(to_load, loaded):
+            items[position] = item
+            if use_cache:
+                uuid = item.uuid
+                new_cache[uuid] = (new_cache[uuid][0], self._file_digests[uuid], item)
+
+        if use_cache and (to_load or len(new_cache) != len(cache)):
+            self._write_item_cache(new_cache)
 
         return items
 
+    def _read_item_cache(self) -> Dict[str, tuple]:
+        """Read the item cache, mapping each item's UUID to the fingerprint and digest of its file and the parsed item."""
+
+        cache_file = self._repo_path / ITEM_CACHE_FILE_NAME
+        try:
+            with open(cache_file, "rb") as f:
+                cache = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self._logger.warning(f"Ignoring unreadable item cache {cache_file}: {e}")
+            return {}
+
+        if cache.get("tag") != _item_cache_tag():
+            self._logger.debug(f"Item cache {cache_file} was written for different item classes, ignoring it")
+            return {}
+
+        return cache["items"]
+
+    def _write_item_cache(self, items : Dict[str, tuple]) -> None:
+        """Write the item cache, replacing the previous one atomically."""
+
+        cache_file = self._repo_path / ITEM_CACHE_FILE_NAME
+        try:
+            write_bytes_atomic(cache_file, pickle.dumps({"tag": _item_cache_tag(), "items": items}, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            # The cache is only an optimisation, so carry on without it
+            self._logger.warning(f"Failed to write item cache {cache_file}: {e}")
+
+    def _scan_item_index(self) -> Dict[str, str]:
+        """Map the UUID of each item in the repo to its JSON file, without reading any of the files."""
+
+        items_dir = self._items_dir
+        if not os.path.isdir(items_dir):
+            self._logger.warning(f"Items directory {items_dir} missing. Creating a new one.")
+            os.mkdir(items_dir)
+
+        item_index = {}
+        # scandir gives us each entry's type from the directory listing itself, without a stat per file
+        with os.scandir(items_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    item_index[entry.name[:-5]] = entry.path
+
+        return item_index
+
+    def _load_item_files_parallel(self, item_files : List[str]) -> Iterator[Item]:
+        """Load items from their JSON files, reading the files on the thread pool."""
+
+        # Reading releases the GIL, so the reads overlap well on the pool. Parsing holds the GIL, so it's done
+        # here rather than on the pool. Files are read a batch at a time to bound how many are held in memory.
+        executor = _get_io_executor()
+        for batch_start in range(0, len(item_files), LOAD_BATCH_SIZE):
+            batch = item_files[batch_start:batch_start + LOAD_BATCH_SIZE]
+            for item_file, item_json in zip(batch, executor.map(self._read_item_file, batch)):
+                yield self._parse_item_json(item_file, item_json)
+
+    def _load_item_file(self, item_file : str) -> Item:
+        """Load a single item from its JSON file."""
+
+        return self._parse_item_json(item_file, self._read_item_file(item_file))
+
+    def _read_item_file(self, item_file : str) -> bytes:
+        """Read the JSON from an item's file."""
+
+        try:
+            return _read_small_file(item_file)
+        except Exception as e:
+            self._logger.error(f"Failed to load item from {item_file}: {e}")
+            raise ValueError(f"Failed to load item from {item_file}: {e}") from e
+
+    def _parse_item_json(self, item_file : str, item_json : bytes) -> Item:
+        """Build an item from the JSON read from its file."""
+
+        try:
+            item_data = fast_json.loads(item_json)
+        except Exception as e:
+            self._logger.error(f"Failed to load item from {item_file}: {e}")
+            raise ValueError(f"Failed to load item from {item_file}: {e}") from e
+
+        # Items are always saved to <uuid>.json, so the file name is the item's UUID. Only double check
+        # that against the JSON in debug runs (asserts are stripped under python -O)
+        item_file_name = os.path.basename(item_file)
+        uuid = item_file_name[:-5]
+        assert uuid == item_data.get("uuid"), f"UUID mismatch: file {item_file_name} vs item_data uuid {item_data.get("uuid")}"
+
+        self._file_digests[uuid] = _digest(item_json)
+
+        # Convert to an Item
+        return Item.from_dict(item_data, uuid=uuid)
+
+    def get_item(self, uuid : str) -> Optional[Item]:
+        """
+        Get a single item by its UUID, or None if there is no such item.
+
+        If the repo's items have not been loaded yet, only this item's file is read.
+        """
+
+        if self._items is not None:
+            self._check_item_indexes()
+            return self._by_uuid.get(uuid)
+
+        if uuid not in self._single_loaded_items:
+            item_file = os.path.join(self._items_dir, f"{uuid}.json")
+            if os.path.dirname(item_file) != self._items_dir or not os.path.isfile(item_file):
+                return None
+            self.plugins # Make sure the item's class has been imported
+            self._single_loaded_items[uuid] = self._load_item_file(item_file)
+
+        return self._single_loaded_items[uuid]
+
     def _load_version(self) -> str:
         """Get the Protomanage version from the PM_VERSION file."""
 
-        version_file = self._repo_path / "PM_VERSION"
-        if not version_file.exists():
-            self._logger.error(f"Version file {version_file} missing.")
-            raise FileNotFoundError(f"Version file {version_file} missing.")
+        version_file = self._repo_file("PM_VERSION")
+        if version_file is None:
+            self._logger.error(f"Version file {self._repo_path / "PM_VERSION"} missing.")
+            raise FileNotFoundError(f"Version file {self._repo_path / "PM_VERSION"} missing.")
 
-        return version_file.read_text().strip()
+        return _read_small_file(version_file, read_size=64).decode("utf8").strip()
 
     def __str__(self) -> str:
         """String representation of the repo, showing the path and UUID."""
@@ -256,38 +455,178 @@ class Repo():
         if not isinstance(item, Item):
             raise TypeError("item must be an instance of Item")
 
-        self._items.append(item)
+        if self._items is None:
+            # Don't load every item just to add one. Keep it with the items get_item() has loaded instead,
+            # so if the full list is loaded later this same object is picked up from there
+            self._single_loaded_items[item.uuid] = item
+        else:
+            self._check_item_indexes()
+            self._items.append(item)
+            self._index_item(item, len(self._items) - 1)
+        self._dirty.add(item.uuid)
         self._save_items()
 
-    def _save_items(self) -> None:
-        """Save the items to the items.json file."""
+    def mark_dirty(self, item: Item) -> None:
+        """
+        Mark an item in the repo as changed, so save_items() writes it.
 
-        items_dir = self._repo_path / "items"
+        Call this after changing an item that was already loaded, e.g. `item.data["status"] = "done"`.
+        """
 
-        if not items_dir.is_dir():
-            self._logger.warning(f"Items directory {items_dir} missing. Creating a new one.")
-            items_dir.mkdir()
+        self._dirty.add(item.uuid)
 
-        for item in self.items:
-            item_file = items_dir / f"{item.uuid}.json"
-            item_json = json.dumps(item.to_dict(), indent=4 if self.config.use_pretty_json else None)
-            item_file.write_text(item_json)
+    def save_items(self) -> None:
+        """Save every item marked dirty since the last save."""
+
+        self._save_items()
+
+    def iter_items(self) -> Iterator[Item]:
+        """
+        Iterate over the repo's items.
+
+        If the items haven't been loaded, they are read one file at a time as the iteration goes,
+        so a caller that stops early doesn't pay for reading every item.
+        """
+
+        if self._items is not None:
+            yield from list(self._items)
+            return
+
+        for uuid in self._scan_item_index():
+            item = self.get_item(uuid)
+            if item is not None:
+                yield item
+
+    def get_items_by_type(self, unique_name : str) -> List[Item]:
+        """Get the items whose type has the given UNIQUE_NAME."""
+
+        self.items # Loads the items (and builds the indexes) if they haven't been already
+        self._check_item_indexes()
+        return list(self._by_type.get(unique_name, {}).values())
+
+    def _build_item_indexes(self) -> None:
+        """Index self.items by UUID, by type and by position."""
+
+        self._by_uuid = {}
+        self._by_type = {}
+        self._item_positions = {}
+        for position, item in enumerate(self._items):
+            self._index_item(item, position)
+
+    def _index_item(self, item : Item, position : int) -> None:
+        """Add an item, found at the given position in self.items, to the indexes."""
+
+        self._by_uuid[item.uuid] = item
+        self._by_type.setdefault(item.__class__.UNIQUE_NAME, {})[item.uuid] = item
+        self._item_positions[item.uuid] = position
+
+    def _unindex_item(self, item : Item) -> None:
+        """Remove an item from the indexes."""
+
+        self._by_uuid.pop(item.uuid, None)
+        self._by_type.get(item.__class__.UNIQUE_NAME, {}).pop(item.uuid, None)
+        self._item_positions.pop(item.uuid, None)
+
+    def _check_item_indexes(self) -> None:
+        """
+        Load the items if they haven't been already, and rebuild the indexes if items have been
+        added to or removed from self.items without going through the repo.
+        """
 
-    def _load_plugins(self) -> None:
+        if len(self._by_uuid) != len(self.items):
+            self._logger.debug("Item list changed outside of the repo's methods, rebuilding item indexes")
+            self._build_item_indexes()
+
+    def _save_items(self, items : Optional[Iterable[Item]] = None, sync : bool = False) -> None:
+        """
+        Save items to their JSON files. By default only the items marked dirty are saved.
+
+        If sync is set, each file and then the items directory are synced to disk, so the saved
+        items survive a crash.
+        """
+
+        if items is None:
+            if self._items is not None:
+                self._check_item_indexes()
+            dirty_items = (self._by_uuid.get(uuid) or self._single_loaded_items.get(uuid) for uuid in self._dirty)
+            items = [item for item in dirty_items if item is not None]
+        else:
+            items = list(items)
+
+        # Serializing holds the GIL, so do it all here first; only the writes themselves go on the pool
+        payloads = [payload for payload in map(self._serialize_item, items) if payload is not None]
+        write_item_payload = partial(self._write_item_payload, sync=sync)
+        if len(payloads) >= PARALLEL_IO_THRESHOLD:
+            # list() so that any exception raised while writing is re-raised here
+            list(_get_io_executor().map(write_item_payload, payloads))
+        else:
+            for payload in payloads:
+                write_item_payload(payload)
+        if sync and payloads:
+            _fsync_dir(self._items_dir) # Once for the whole batch, to keep the renames
+
+        self._dirty.difference_update(item.uuid for item in items)
+
+    def _save_single_item(self, item : Item) -> None:
+        """Save a single item to its JSON file, unless the file already holds exactly this JSON."""
+        payload = self._serialize_item(item)
+        if payload is not None:
+            self._write_item_payload(payload)
+
+    def _serialize_item(self, item : Item) -> Optional[tuple]:
+        """Get (uuid, file path, JSON, digest) for saving an item, or None if its file already holds this JSON."""
+        item_json = fast_json.dumps(item.to_dict(), pretty=self.config.use_pretty_json)
+        digest = _digest(item_json)
+        if self._file_digests.get(item.uuid) == digest:
+            return None
+        return (item.uuid, os.path.join(self._items_dir, f"{item.uuid}.json"), item_json, digest)
+
+    def _write_item_payload(self, payload : tuple, sync : bool = False) -> None:
+        """Write an item's JSON, as returned by _serialize_item, to its file via a temp file and rename."""
+        uuid, item_file, item_json, digest = payload
+        try:
+            write_bytes_atomic(item_file, item_json, sync=sync)
+        except FileNotFoundError:
+            # Only look for the items directory when a write fails, rather than checking before every save
+            if os.path.isdir(self._items_dir):
+                raise
+            self._logger.warning(f"Items directory {self._items_dir} missing. Creating a new one.")
+            Path(self._items_dir).mkdir(exist_ok=True)
+            write_bytes_atomic(item_file, item_json, sync=sync)
+        self._file_digests[uuid] = digest
+
+    def _load_plugins(self) -> List["module"]:
         """Load in plugins (module objects) and returns a list of these objects"""
-        plugins = []
-        plugins_dir = self.repo_path / "plugins"
+        return [self.get_plugin(name) for name in self._discover_plugins()]
+
+    def _discover_plugins(self) -> Dict[str, str]:
+        """Find the repo's plugins without importing them, mapping each plugin's name to its __init__.py file."""
+        if self._plugin_index is not None:
+            return self._plugin_index
+
+        plugin_index = {}
+        plugins_dir = self._repo_file("plugins")
+
+        if plugins_dir is not None and plugins_dir.is_dir():
+            with os.scandir(plugins_dir) as entries:
+                for entry in entries:
+                    init_file = os.path.join(entry.path, "__init__.py")
+                    if os.path.isfile(init_file):
+                        plugin_index[entry.name] = init_file
+                    else:
+                        raise Exception(f"Plugin at directory {entry.path} has no __init__.py file")
 
-        if plugins_dir.exists() and plugins_dir.is_dir():
-            for plugin_path in plugins_dir.iterdir():
-                init_file = plugin_path / "__init__.py"
-                module_name = f"{plugin_path.name}"
-                if init_file.exists():
-                    plugins.append( _import_from_path(module_name,init_file) )
-                else:
-                    raise Exception(f"Plugin at directory {plugin_path} has no __init__.py file")
+        self._plugin_index = plugin_index
+        return plugin_index
 
-        return plugins
+    def get_plugin(self, name : str) -> "module":
+        """Get a single plugin by name, importing only that plugin if the others haven't been imported."""
+        if name not in self._imported_plugins:
+            plugin_index = self._discover_plugins()
+            if name not in plugin_index:
+                raise KeyError(f"No plugin named '{name}' in repo {self}")
+            self._imported_plugins[name] = _import_from_path(name, plugin_index[name])
+        return self._imported_plugins[name]
 
     def configure_app(self, app, execution_context) -> None:
         """Takes an arbitrary 'app' and passes it on to each plugin for configuration"""
@@ -312,9 +651,13 @@ class Repo():
         (repo_path / "config.json"     ).write_text("{}") # TODO add option to create a config.json populated with nulls instead
         (repo_path / "PM_VERSION"      ).write_text("TODO version numbering")
         (repo_path / "uuid"            ).write_text(uuid)
+        (repo_path / ".gitignore"      ).write_text(f"{ITEM_CACHE_FILE_NAME}\n") # The item cache is a local, binary file
 
     @property
     def plugins(self) -> List["module"]:
+        """Get the repo's plugins, importing them on first access."""
+        if self._plugins is None:
+            self._plugins = self._load_plugins()
         return self._plugins
 
     @property
@@ -324,17 +667,24 @@ class Repo():
 
     @property
     def config(self) -> RepoConfig:
-        """Get the repo config."""
+        """Get the repo config, loading it on first access."""
+        if self._config is None:
+            self._load_config()
         return self._config
 
     @property
     def items(self) -> List[Item]:
-        """Get the items in the repo."""
+        """Get the items in the repo, loading them from disk on first access."""
+        if self._items is None:
+            self._items = self._load_items()
+            self._build_item_indexes()
         return self._items
 
     @property
     def pm_version(self) -> str:
         """Get the Protomanage version of the repo."""
+        if self._pm_version is None:
+            self._pm_version = self._load_version()
         return self._pm_version
 
     @property
@@ -342,25 +692,157 @@ class Repo():
         """Get the path to the repo."""
         return self._repo_path
 
+_repos = {} # Repo instances opened by find_repo/get_home_repo, keyed by the repo's real path
+_found_repo_paths = {} # Maps each directory find_repo has searched from to the path of the repo it found
+
 def find_repo(cwd : Path) -> Repo:
     """Find a Protomanage repo starting from the current working directory and moving up the directory tree."""
 
-    current_path = cwd
-    while current_path != current_path.parent:
-        repo_path = current_path / REPO_FOLDER_NAME
-        if repo_path.exists() and repo_path.is_dir():
-            try:
-                return Repo(repo_path)
-            except FileNotFoundError as e:
-                logging.error(f"Failed to load repo at {repo_path}: {e}")
-                raise FileNotFoundError(f"Failed to load repo at {repo_path}: {e}") from e
-        current_path = current_path.parent
-    return get_home_repo()
+    # Walk with plain str paths, so each level costs one stat and no Path objects
+    current_path = os.path.abspath(cwd)
+    searched_paths = []
+    while (parent_path := os.path.dirname(current_path)) != current_path:
+        repo_path = _found_repo_paths.get(current_path)
+        if repo_path is not None:
+            break
+        searched_paths.append(current_path)
+        candidate_path = os.path.join(current_path, REPO_FOLDER_NAME)
+        if os.path.isdir(candidate_path): # One stat, rather than exists() and then is_dir()
+            repo_path = Path(candidate_path)
+            break
+        current_path = parent_path
+    else:
+        repo_path = HOME_REPO_PATH
+
+    try:
+        repo = _get_repo(repo_path)
+    except FileNotFoundError as e:
+        if repo_path == HOME_REPO_PATH:
+            raise
+        _logger.error(f"Failed to load repo at {repo_path}: {e}")
+        raise FileNotFoundError(f"Failed to load repo at {repo_path}: {e}") from e
+
+    for path in searched_paths:
+        _found_repo_paths[path] = repo_path
+    return repo
 
 def get_home_repo() -> Repo:
     """Return the Protomanage home repo"""
 
-    return Repo(HOME_REPO_PATH)
+    return _get_repo(HOME_REPO_PATH)
+
+def _get_repo(repo_path : Path) -> Repo:
+    """Get the Repo at the given path, opening it only the first time it is asked for."""
+
+    # Key on the real path so a repo reached through a symlink is still only opened once, but open it
+    # through the path given (the real folder might not be named .protomanage)
+    real_path = os.path.realpath(repo_path)
+    if real_path not in _repos:
+        _repos[real_path] = Repo(repo_path)
+    return _repos[real_path]
+
+def write_bytes_atomic(path : str | Path, data : bytes, sync : bool = False) -> None:
+    """
+    Write a file via a temporary file renamed into place, so the file is never seen half-written.
+
+    If sync is set, the data is flushed to disk before the rename, so that after a crash the file
+    holds either its old or its new contents (the caller syncs the directory to keep the rename).
+    """
+    directory, name = os.path.split(path)
+    temp_name = None
+    try:
+        with tempfile.NamedTemporaryFile("wb", dir=directory, prefix=f".{name}.", suffix=".tmp", delete=False) as f:
+            temp_name = f.name
+            f.write(data)
+            if hasattr(os, "fchmod"): # Temporary files are created readable by their owner only
+                os.fchmod(f.fileno(), NEW_FILE_MODE)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        if temp_name and os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+def _fsync_dir(directory : str | Path) -> None:
+    """Commit a directory's entries to disk. Does nothing on Windows, where directories can't be opened."""
+    if os.name == "nt":
+        return
+
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def _scan_dir(path : Path) -> Dict[str, str]:
+    """List a directory in one pass, mapping each entry's name to its path."""
+    with os.scandir(path) as entries:
+        return {entry.name: entry.path for entry in entries}
+
+def _read_small_file(path : str | Path, read_size : int = SMALL_FILE_READ_SIZE) -> bytes:
+    """
+    Read a whole file with plain os.read calls, skipping the buffered and text IO layers.
+
+    Meant for the repo's small files (items, uuid, config...), which are read in a single os.read.
+    os.read allocates read_size bytes up front, so pass a smaller read_size for files known to be tiny.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        data = os.read(fd, read_size)
+        if len(data) < read_size:
+            return data # A short read of a regular file means we've reached the end
+
+        chunks = [data]
+        while chunk := os.read(fd, read_size):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+def _parse_config_file(config_file : Path, fingerprint : tuple) -> dict:
+    """Parse a config.json, reusing the previous parse if the file's fingerprint hasn't changed."""
+    cached = _parsed_config_files.get(config_file)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    config_data = fast_json.loads(_read_small_file(config_file))
+    _parsed_config_files[config_file] = (fingerprint, config_data)
+    return config_data
+
+def _digest(data : bytes) -> bytes:
+    """Get a short digest of some bytes, to tell whether a file's contents would change."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _file_fingerprint(path : str) -> tuple:
+    """Get the modification time and size of a file, which change whenever the file is rewritten."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _item_cache_tag() -> tuple:
+    """
+    Identify the currently defined item classes, so a cache written when they were different is discarded.
+
+    Each class's source file is fingerprinted too, so editing a class (e.g. its _from_dict) without
+    bumping its VERSION still invalidates the cached objects. So is the ExecutionContext module,
+    since items hold pickled ExecutionContext objects.
+    """
+    classes, class_tags = [Item], set()
+    while classes:
+        cls = classes.pop()
+        class_tags.add((cls.__module__, cls.__qualname__, cls.UNIQUE_NAME, cls.VERSION, *_module_source_tag(cls.__module__)))
+        classes.extend(cls.CHILD_CLASSES)
+    return (ITEM_CACHE_FORMAT, sorted(class_tags), _module_source_tag(execution_context.__name__))
+
+def _module_source_tag(module_name : str) -> tuple:
+    """Get a module's source file and that file's fingerprint, or empty values if it has none."""
+    source_file = getattr(sys.modules.get(module_name), "__file__", None) or ""
+    try:
+        source_fingerprint = _file_fingerprint(source_file) if source_file else ()
+    except OSError:
+        source_fingerprint = ()
+    return (source_file, source_fingerprint)
 
 def _import_from_path(module_name, file_path):
     spec = importlib.util.spec_from_file_location(module_name, file_path)
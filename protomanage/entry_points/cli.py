@@ -10,6 +10,17 @@ as well as to access current_repo and execution_context in these commands
 TODO wrap current_repo into execution_context and improve its flexibility to non-CLI accesses?
 """
 
+import sys
+
+# Answer --version before importing typer, finding the repo, or importing any plugins
+if sys.argv[1:] == ["--version"]:
+    from importlib import metadata
+    try:
+        print(metadata.version("protomanage"))
+    except metadata.PackageNotFoundError:
+        print("unknown (protomanage is not installed)")
+    sys.exit(0)
+
 # Third-party imports
 import typer
 from typing_extensions import Annotated
@@ -9,4 +9,5 @@ def print_hello() -> None:
 def print_hello2() -> None:
     print("HELLO 2!")
 
-app(["print-hello"],["print-hello2"])
+if __name__ == "__main__":
+    app()
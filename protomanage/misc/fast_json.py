@@ -0,0 +1,42 @@
+"""JSON (de)serialization helpers which use orjson if it is installed, and fall back to the standard library otherwise."""
+
+import json
+from pathlib import PurePath
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Deserialize JSON from a bytes or str object."""
+
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _default(obj):
+    """Serialize the non-JSON types protomanage stores, raising TypeError for anything else."""
+
+    if isinstance(obj, (PurePath, UUID)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj, pretty : bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON, indented if pretty is set.
+
+    Path and UUID objects are serialized as their str(); other values JSON has no type for raise TypeError.
+    """
+
+    if orjson:
+        # OPT_NON_STR_KEYS converts e.g. int keys to strings, as the json module does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    # Lay the output out like orjson does (2-space indent or compact, UTF-8 rather than \u escapes).
+    # The two can still differ for some values, e.g. orjson writes datetimes and dataclasses
+    # natively and rejects NaN, so don't rely on them producing identical bytes
+    if pretty:
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode("utf8")
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf8")
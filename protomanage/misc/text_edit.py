@@ -11,7 +11,7 @@ def open_file_for_edit(file_path,editor):
 
     subprocess.run([editor, file_path], check=True)
 
-def open_string_for_edit(string,editor):
+def open_string_for_edit(string,editor,scratch_dir=None):
     """
     Allows the user to edit a given string using their default text editor.
 
@@ -21,6 +21,8 @@ def open_string_for_edit(string,editor):
 
     Args:
         string (str): The initial string to be edited by the user.
+        editor (str): The text editor to open the file with.
+        scratch_dir (str): Directory to create the temporary file in. Defaults to the system temp directory.
 
     Returns:
         str: The string after being edited by the user.
@@ -28,15 +30,37 @@ def open_string_for_edit(string,editor):
     Raises:
         Any exception raised by `open_file_for_edit` or file operations will propagate.
     """
-    with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".temp") as tmp_file:
-        tmp_file.write(string)
-        tmp_file_path = tmp_file.name
-
+    fd, tmp_file_path = tempfile.mkstemp(suffix=".temp", dir=scratch_dir)
     try:
+        try:
+            _write_all(fd, string.encode("utf8"))
+        finally:
+            os.close(fd)
+
         open_file_for_edit(tmp_file_path,editor)
-        with open(tmp_file_path, "r",encoding="utf8") as f:
-            edited_string = f.read()
+
+        # The editor may have replaced the file rather than writing to it, so open it again
+        fd = os.open(tmp_file_path, os.O_RDONLY)
+        try:
+            edited_string = _read_all(fd).decode("utf8")
+        finally:
+            os.close(fd)
     finally:
-        os.remove(tmp_file_path)
+        os.unlink(tmp_file_path)
 
     return edited_string
+
+def _write_all(fd,data):
+    """Write all of data to a file descriptor, looping over partial writes."""
+
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _read_all(fd):
+    """Read a file descriptor to the end and return its contents as bytes."""
+
+    chunks = []
+    while chunk := os.read(fd, 65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
@@ -1,5 +1,5 @@
-import json
-
+from protomanage.base.repo import write_bytes_atomic
+from protomanage.misc import fast_json
 from protomanage.misc.text_edit import open_string_for_edit
 
 def _configure_cli_app(app,current_repo,execution_context):
@@ -8,13 +8,15 @@ def _configure_cli_app(app,current_repo,execution_context):
         """Edit the config.json file for this repo."""
 
         config_file = current_repo.repo_path / "config.json"
-        config_json = json.dumps(json.loads(config_file.read_text()), indent=4) # load then dump again so we can prettify
-        config_json = open_string_for_edit(config_json,editor=current_repo.config.default_text_editor)
-        if current_repo.config.use_pretty_json:
-            config_json = json.dumps(json.loads(config_json), indent=4)
-        else:
-            config_json = json.dumps(json.loads(config_json), indent=None)
-        config_file.write_text(config_json)
+        original_json = fast_json.dumps(fast_json.loads(config_file.read_bytes()), pretty=True).decode("utf8") # load then dump again so we can prettify
+        config_json = open_string_for_edit(
+            original_json,
+            editor=current_repo.config.default_text_editor,
+            scratch_dir=current_repo.config.scratch_dir
+        )
+        if config_json == original_json:
+            return # Nothing was edited, so there's nothing to parse, write or reload
+        write_bytes_atomic(config_file, fast_json.dumps(fast_json.loads(config_json), pretty=current_repo.config.use_pretty_json))
         current_repo.update_config()
 
 def configure_app(app,current_repo,execution_context):
@@ -64,7 +64,7 @@ def _add_to_inbox(text : str, repo : "Repo", context : "ExecutionContext") -> No
 def _show_inbox(repo : "Repo", context : "ExecutionContext") -> None:
     """Retrieve all InboxItems from the repo's item list and display to the user"""
 
-    inbox_items = [item for item in repo.items if isinstance(item,InboxItem)]
+    inbox_items = repo.get_items_by_type(InboxItem.UNIQUE_NAME)
     if not inbox_items:
         print("No items in inbox!")
     else: